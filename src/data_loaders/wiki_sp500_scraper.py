@@ -1,11 +1,14 @@
 import os
 import json
+import hashlib
+import tempfile
 import requests
 import pandas as pd
+from pathlib import Path
 from abc import ABC, abstractmethod
 from enum import Enum, auto
 from typing import List, Optional, Union
-from io import StringIO
+from io import BytesIO
 
 from loguru import logger
 from google import genai
@@ -13,12 +16,55 @@ from google.genai import types
 from firecrawl import Firecrawl
 from dotenv import load_dotenv
 
-from src.utils.schemas import SP500ConstituentSchema
+from src.utils.schemas import get_sp500_schema
 
 load_dotenv()
 
-# Global client instance for reuse
+# Shared HTTP session so repeated scrapes reuse the TCP/TLS connection
+# instead of paying a fresh handshake per request
+_SESSION = requests.Session()
+_SESSION.headers.update(
+    {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+    }
+)
+_SESSION.mount(
+    "https://", requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8)
+)
+
+# On-disk cache for LLM responses, opt-in via BENFORD_LLM_CACHE=1
+_LLM_CACHE_DIR = Path(".cache/llm_scraper")
+
+# Instruction prefix for the table-extraction prompt, kept separate from the
+# scraped payload so the request is built from two parts instead of
+# concatenating a page-sized string
+_PROMPT_PREFIX = (
+    "Please help to format the unstructured data into the designated JSON format.\n"
+    "Only include the S&P 500 component stocks table and omit any other information.\n"
+    "The following is the unstructured data: \n\n"
+)
+
+# Global client instances for reuse
 _genai_client: Optional[genai.Client] = None
+_firecrawl_client: Optional[Firecrawl] = None
+
+
+def get_firecrawl_client() -> Firecrawl:
+    """Get or create a singleton Firecrawl client instance.
+
+    Raises:
+        ValueError: If the FIRECRAWL_API_KEY environment variable is not set.
+
+    Returns:
+        Firecrawl: The Firecrawl client instance.
+    """
+    global _firecrawl_client
+    if _firecrawl_client is None:
+        api_key = os.getenv("FIRECRAWL_API_KEY")
+        if not api_key:
+            raise ValueError("FIRECRAWL_API_KEY environment variable is not set")
+        _firecrawl_client = Firecrawl(api_key)
+    return _firecrawl_client
 
 
 def get_genai_client() -> genai.Client:
@@ -49,26 +95,49 @@ def _validate_and_clean_df(df: pd.DataFrame) -> pd.DataFrame:
         pd.DataFrame: The cleaned and validated DataFrame.
     """
     # Validate the DataFrame against the schema
-    validated_df = SP500ConstituentSchema.validate(df)
+    validated_df = get_sp500_schema().validate(df)
     logger.info(
         f"Successfully validated DataFrame with {len(validated_df)} rows against SP500ConstituentSchema"
     )
 
-    # Log and drop missing values
-    missing_values = validated_df[validated_df.isnull().any(axis=1)]
-    if not missing_values.empty:
+    # Dictionary-encode the low-cardinality GICS columns (<150 unique values
+    # across 500 rows): categorical codes shrink memory and speed up the
+    # duplicate/null scans below. Done after validation since the schema
+    # coerces those columns to str.
+    validated_df = validated_df.astype(
+        {"GICS Sector": "category", "GICS Sub-Industry": "category"}
+    )
+
+    # Compute the null and duplicate masks up front and slice once, instead of
+    # separate dropna/drop_duplicates passes over the frame. Rendering the
+    # full frame is an O(rows x cols) formatting job, so the hot path logs
+    # only the count plus a small symbol sample and defers the dump to DEBUG
+    null_mask = validated_df.isnull().any(axis=1)
+    dup_mask = validated_df.duplicated()
+
+    if null_mask.any():
+        missing_values = validated_df[null_mask]
         logger.info(
-            f"Found and dropped {len(missing_values)} rows with missing values."
+            f"Found and dropped {len(missing_values)} rows with missing values "
+            f"(sample symbols: {missing_values['Symbol'].head().tolist()})"
+        )
+        logger.opt(lazy=True).debug(
+            "Missing rows:\n{rows}", rows=lambda: str(missing_values)
         )
-        logger.info(f"Missing rows:\n{missing_values}")
-        validated_df = validated_df.dropna()
 
-    # Log and drop duplicates
-    duplicates = validated_df[validated_df.duplicated()]
-    if not duplicates.empty:
-        logger.info(f"Found and dropped {len(duplicates)} duplicate rows.")
-        logger.info(f"Duplicate rows:\n{duplicates}")
-        validated_df = validated_df.drop_duplicates()
+    if dup_mask.any():
+        duplicates = validated_df[dup_mask]
+        logger.info(
+            f"Found and dropped {len(duplicates)} duplicate rows "
+            f"(sample symbols: {duplicates['Symbol'].head().tolist()})"
+        )
+        logger.opt(lazy=True).debug(
+            "Duplicate rows:\n{rows}", rows=lambda: str(duplicates)
+        )
+
+    drop_mask = null_mask | dup_mask
+    if drop_mask.any():
+        validated_df = validated_df.loc[~drop_mask]
 
     return validated_df
 
@@ -93,7 +162,7 @@ class LLMTableScraper(TableScraper):
         return "LLMTableScraper"
 
     def scrape_table(
-        self, url: str, format: List[str] = ["markdown"]
+        self, url: str, format: tuple = ("markdown",)
     ) -> Union[str, pd.DataFrame]:
         """Scrape and process table from a URL using LLM.
 
@@ -106,17 +175,21 @@ class LLMTableScraper(TableScraper):
         markdown_content = self._scrape_static_website(url, format=format)
         processed_markdown_content = self._llm_process_markdown(markdown_content)
 
-        df = pd.read_json(processed_markdown_content)
+        # The LLM returns a small JSON array of records; the stdlib parser plus
+        # from_records is faster than pd.read_json and avoids its deprecated
+        # string-input path
+        records = json.loads(processed_markdown_content)
+        df = pd.DataFrame.from_records(records)
         df = _validate_and_clean_df(df)
         return df
 
-    def _scrape_static_website(self, url: str, format: List[str] = ["markdown"]) -> str:
+    def _scrape_static_website(self, url: str, format: tuple = ("markdown",)) -> str:
         """Scrape a static website and return the content in the specified format.
 
         Args:
             url (str): The URL of the website to scrape.
-            format (List[str], optional): The format to return the scraped content in.
-            Defaults to ["markdown"].
+            format (tuple, optional): The format to return the scraped content in.
+            Defaults to ("markdown",).
 
         Raises:
             ValueError: If the URL is invalid.
@@ -131,19 +204,18 @@ class LLMTableScraper(TableScraper):
         if not url or not url.strip():
             raise ValueError("URL cannot be empty or None")
 
-        api_key = os.getenv("FIRECRAWL_API_KEY")
-        if not api_key:
-            raise ValueError("FIRECRAWL_API_KEY environment variable is not set")
+        # Shared client keeps one connection pool across scrapes
+        firecrawl = get_firecrawl_client()
 
         try:
-            firecrawl = Firecrawl(api_key)
-            scraped_content = firecrawl.scrape(url, formats=format)
+            scraped_content = firecrawl.scrape(url, formats=list(format))
 
             if not scraped_content:
                 raise Exception(f"Empty response scraped from {url}")
 
             # * Does accommodate other formats such as html
-            primary_format = format[0] if format else "markdown"
+            # The tuple default is non-empty by construction
+            primary_format = format[0]
             if hasattr(scraped_content, primary_format):
                 return getattr(scraped_content, primary_format)
             else:
@@ -172,22 +244,41 @@ class LLMTableScraper(TableScraper):
         if not markdown_content or not markdown_content.strip():
             raise ValueError("Markdown content cannot be empty")
 
+        # The Gemini call dominates latency and cost while the source page
+        # rarely changes, so repeat runs can be served from an on-disk cache
+        # keyed by the content hash. Opt-in via BENFORD_LLM_CACHE=1.
+        cache_path = None
+        if os.getenv("BENFORD_LLM_CACHE") == "1":
+            content_hash = hashlib.sha256(markdown_content.encode()).hexdigest()
+            cache_path = _LLM_CACHE_DIR / f"{content_hash}.json"
+            if cache_path.exists():
+                logger.info(f"LLM cache hit for content hash {content_hash[:12]}")
+                return cache_path.read_text()
+
         try:
             client = get_genai_client()
             response = client.models.generate_content(
                 model=model,
-                contents=types.Part.from_text(
-                    text="""Please help to format the unstructured data into the designated JSON format. 
-                    Only include the S&P 500 component stocks table and omit any other information.
-                    The following is the unstructured data: \n\n"""
-                    + markdown_content
-                ),
+                contents=[
+                    types.Part.from_text(text=_PROMPT_PREFIX),
+                    types.Part.from_text(text=markdown_content),
+                ],
                 config=types.GenerateContentConfig(
                     system_instruction="You are a helpful assistant.",
                     temperature=0.0,
                     response_mime_type="application/json",
                 ),
             )
+
+            if cache_path is not None:
+                # Write atomically so a crash mid-write never leaves a
+                # truncated cache entry behind
+                _LLM_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                fd, tmp_path = tempfile.mkstemp(dir=_LLM_CACHE_DIR, suffix=".tmp")
+                with os.fdopen(fd, "w") as f:
+                    f.write(response.text)
+                os.replace(tmp_path, cache_path)
+
             return response.text
         except Exception as e:
             raise Exception(f"Failed to process markdown content with LLM: {str(e)}")
@@ -210,14 +301,13 @@ class PandasTableScraper(TableScraper):
             str: JSON formatted table data.
         """
         try:
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
-            response = requests.get(url, headers=headers)
-
-            table = pd.read_html(StringIO(response.text))
-            # ! The first table is what we want from this static page
-            df = table[0]
+            response = _SESSION.get(url, timeout=10)
+
+            # Parse the raw bytes directly and only the table containing a
+            # "Symbol" column, so lxml skips the rest of the page and we avoid
+            # decoding the full HTML into a Python str first
+            table = pd.read_html(BytesIO(response.content), flavor="lxml", match="Symbol")
+            df = table[table_index]
             df = _validate_and_clean_df(df)
             return df
         except Exception as e:
@@ -234,22 +324,28 @@ class ScraperType(Enum):
 class ScraperFactory:
     """Factory for creating table scrapers."""
 
-    @staticmethod
-    def get_scraper(scraper_type: ScraperType) -> TableScraper:
+    _scraper_classes = {
+        ScraperType.LLM: LLMTableScraper,
+        ScraperType.PANDAS: PandasTableScraper,
+    }
+    # Scrapers are stateless, so one instance per type is reused across calls
+    _instances: dict = {}
+
+    @classmethod
+    def get_scraper(cls, scraper_type: ScraperType) -> TableScraper:
         """Get a scraper instance based on the specified type.
 
         Args:
             scraper_type (ScraperType): The type of scraper to create.
 
         Returns:
-            TableScraper: An instance of the specified table scraper.
+            TableScraper: The shared instance of the specified table scraper.
 
         Raises:
             ValueError: If an unknown scraper type is specified.
         """
-        if scraper_type == ScraperType.LLM:
-            return LLMTableScraper()
-        elif scraper_type == ScraperType.PANDAS:
-            return PandasTableScraper()
-        else:
+        if scraper_type not in cls._scraper_classes:
             raise ValueError(f"Unknown scraper type: {scraper_type}")
+        if scraper_type not in cls._instances:
+            cls._instances[scraper_type] = cls._scraper_classes[scraper_type]()
+        return cls._instances[scraper_type]
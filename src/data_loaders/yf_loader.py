@@ -1,43 +1,130 @@
 import yfinance as yf
 import pandas as pd
+import json
 import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import timedelta
 from loguru import logger
+from requests.exceptions import RequestException
 from typing import List, Union, Optional, Any
-from src.utils.schemas import MarketCapSchema
+from src.utils.schemas import get_market_cap_schema
+
+# Optional cached + rate-limited HTTP session, as recommended by yfinance.
+# Cache hits become local SQLite reads and the limiter keeps us clear of
+# Yahoo's 429s; falls back to yfinance's default session handling when the
+# extras are not installed.
+try:
+    from requests import Session
+    from requests_cache import CacheMixin, SQLiteCache
+    from requests_ratelimiter import LimiterMixin
+
+    class CachedLimiterSession(CacheMixin, LimiterMixin, Session):
+        """requests.Session with on-disk response caching and rate limiting."""
+
+except ImportError:
+    CachedLimiterSession = None
+    logger.warning(
+        "requests-cache/requests-ratelimiter not installed; yfinance calls "
+        "will run without response caching or rate limiting "
+        "(install the yfinance[nospam] extra to enable them)"
+    )
+
+# info-style field names that the much cheaper fast_info quote endpoint can
+# serve, mapped to their fast_info keys
+_FAST_INFO_FIELDS = {
+    "marketCap": "marketCap",
+    "sharesOutstanding": "shares",
+    "currency": "currency",
+    "previousClose": "previousClose",
+    "open": "open",
+    "dayHigh": "dayHigh",
+    "dayLow": "dayLow",
+    "exchange": "exchange",
+    "lastPrice": "lastPrice",
+}
+
+
+# Hot symbols get queried repeatedly within one process (market-cap calc,
+# plotting, notebook re-runs); cache the full payload so only the first call
+# hits Yahoo. Keyed by session identity so caches stay per-session, and capped
+# at 128 entries since each payload is on the order of 1-2 MB.
+@lru_cache(maxsize=128)
+def _cached_info(ticker: str, session) -> dict:
+    return yf.Ticker(ticker, session=session).info
 
 
 class YFinanceLoader:
-    def __init__(self, max_retries: int = 3, delay: float = 1.0):
+    def __init__(self, max_retries: int = 3, delay: float = 1.0, max_workers: int = 8):
         self.max_retries = max_retries
         self.delay = delay
+        self.max_workers = max_workers
+        # Bound in-flight requests so the thread pool stays within Yahoo's
+        # rate limits even if max_workers is raised
+        self._throttle = threading.Semaphore(max_workers)
+        # One shared session for all yfinance calls: TCP reuse, response
+        # caching, and rate limiting in one place
+        if CachedLimiterSession is not None:
+            self.session = CachedLimiterSession(
+                per_minute=60,
+                per_hour=360,
+                backend=SQLiteCache("yf.cache"),
+                # Fundamentals rarely change intraday; price history does
+                expire_after=timedelta(hours=24),
+                urls_expire_after={
+                    "*.yahoo.com/v8/finance/chart*": timedelta(hours=1)
+                },
+            )
+        else:
+            self.session = None
+        # Lowercased column lookup per fetched frame, built once per frame so
+        # repeated substring searches skip re-lowercasing all 176 column names
+        self._lower_cols_cache: dict = {}
 
-    # * Stock info has 176 columns, probably not worth the effort to define
-    # * a schema for data validation
-    def get_stock_info(
+    def _fetch_one(
         self,
-        tickers: Union[List[str], str],
-        fields: Union[List[str], None] = None,
-        as_dataframe: bool = True,
-    ) -> Union[pd.DataFrame, List[dict]]:
-        """Fetch stock information from Yahoo Finance.
+        ticker: str,
+        fields: Union[List[str], None],
+        ticker_obj: Optional[yf.Ticker] = None,
+    ) -> Optional[dict]:
+        """Fetch stock info for a single ticker with retries.
 
         Args:
-            tickers (Union[List[str], str]): The stock ticker symbols to fetch data for.
-            fields (Union[List[str], None], optional): The specific fields to retrieve. Defaults to None.
-            as_dataframe (bool, optional): Whether to return the data as a DataFrame. Defaults to True.
+            ticker (str): The stock ticker symbol.
+            fields (Union[List[str], None]): The specific fields to retrieve.
+            ticker_obj (Optional[yf.Ticker]): Pre-built Ticker (e.g. a child of
+                a shared yf.Tickers) to reuse instead of constructing one.
 
         Returns:
-            Union[pd.DataFrame, List[dict]]: The stock information, either as a DataFrame or a list of dictionaries.
+            Optional[dict]: The (optionally filtered) info dict, or None if
+                all retries failed.
         """
-
-        if isinstance(tickers, str):
-            tickers = [tickers]
-
-        stock_data = []
-        for ticker in tickers:
+        with self._throttle:
             for attempt in range(self.max_retries):
                 try:
-                    data = yf.Ticker(ticker).info
+                    tk = (
+                        ticker_obj
+                        if ticker_obj is not None
+                        else yf.Ticker(ticker, session=self.session)
+                    )
+                    # When every requested field is quote-level, fast_info hits
+                    # a single quote endpoint instead of the full 176-field
+                    # quoteSummary payload
+                    if fields and all(f in _FAST_INFO_FIELDS for f in fields):
+                        fast_info = tk.fast_info
+                        filtered_data = {
+                            field: fast_info.get(_FAST_INFO_FIELDS[field])
+                            for field in fields
+                        }
+                        filtered_data["symbol"] = ticker
+                        return filtered_data
+
+                    data = (
+                        ticker_obj.info
+                        if ticker_obj is not None
+                        else _cached_info(ticker, self.session)
+                    )
 
                     if fields:
                         filtered_data = {
@@ -45,11 +132,10 @@ class YFinanceLoader:
                         }
                         # keep the symbol so we can group by it later
                         filtered_data["symbol"] = ticker
-                        stock_data.append(filtered_data)
-                    else:
-                        stock_data.append(data)
-                    break  # Success, exit retry loop
-                except Exception as e:
+                        return filtered_data
+                    return data
+                except (RequestException, json.JSONDecodeError) as e:
+                    # Transient network/parse failures are worth retrying
                     logger.error(
                         f"Error fetching data for {ticker} (attempt {attempt + 1}/{self.max_retries}): {e}"
                     )
@@ -59,36 +145,111 @@ class YFinanceLoader:
                         logger.error(
                             f"Failed to fetch data for {ticker} after {self.max_retries} attempts."
                         )
+                except Exception as e:
+                    # Anything else (malformed/delisted ticker, attribute
+                    # errors) won't get better with retries: fail fast instead
+                    # of burning max_retries * delay per bad symbol
+                    logger.error(f"Non-retryable error fetching data for {ticker}: {e}")
+                    break
+        return None
+
+    def _iter_stock_info(self, tickers: List[str], fields: Union[List[str], None]):
+        """Yield per-ticker info dicts as the threaded fetches complete.
+
+        Generator form of the fan-out so callers that only need to build a
+        lookup can consume results without materializing an intermediate list.
+
+        Args:
+            tickers (List[str]): The stock ticker symbols.
+            fields (Union[List[str], None]): The specific fields to retrieve.
+
+        Yields:
+            dict: Info dict per successfully fetched ticker, in input order.
+        """
+        # One shared yf.Tickers parent lets every child reuse the same cached
+        # crumb and cookie instead of re-negotiating them per yf.Ticker
+        # construction; Tickers keys its children by uppercased symbol
+        ticker_objs = {}
+        if len(tickers) > 1:
+            ticker_objs = yf.Tickers(" ".join(tickers), session=self.session).tickers
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for data in executor.map(
+                lambda t: self._fetch_one(t, fields, ticker_objs.get(t.upper())),
+                tickers,
+            ):
+                if data is not None:
+                    yield data
+
+    # * Stock info has 176 columns, probably not worth the effort to define
+    # * a schema for data validation
+    def get_stock_info(
+        self,
+        tickers: Union[List[str], str],
+        fields: Union[List[str], None] = None,
+        as_dataframe: bool = True,
+    ) -> Union[pd.DataFrame, List[dict]]:
+        """Fetch stock information from Yahoo Finance.
+
+        Args:
+            tickers (Union[List[str], str]): The stock ticker symbols to fetch data for.
+            fields (Union[List[str], None], optional): The specific fields to retrieve. Defaults to None.
+            as_dataframe (bool, optional): Whether to return the data as a DataFrame. Defaults to True.
+
+        Returns:
+            Union[pd.DataFrame, List[dict]]: The stock information, either as a DataFrame or a list of dictionaries.
+        """
+
+        if isinstance(tickers, str):
+            tickers = [tickers]
+
+        # The per-ticker fetches are I/O-bound, so overlap them with a small
+        # thread pool; results arrive in the input ticker order
+        stock_data = list(self._iter_stock_info(tickers, fields))
 
         if as_dataframe:
+            # With a fixed field list the columns are known up front, so
+            # from_records skips the key-union scan pandas otherwise runs over
+            # every 176-key dict to infer the column set
+            if fields:
+                return pd.DataFrame.from_records(
+                    stock_data, columns=list(fields) + ["symbol"]
+                )
             return pd.DataFrame(stock_data)
         return stock_data
 
-    # * Not really useful to keep this for a single ticker
-    # def get_stock_info_value(
-    #     self,
-    #     ticker: str,
-    #     field: str,
-    # ) -> Optional[Any]:
-    #     """Get a single field value from stock info.
-
-    #     Args:
-    #         ticker (str): The stock ticker symbol.
-    #         field (str): The field name to retrieve.
-
-    #     Returns:
-    #         Optional[Any]: The field value if found, None otherwise.
-    #     """
-    #     stock_info = self.get_stock_info(
-    #         tickers=ticker, fields=[field], as_dataframe=False
-    #     )
-    #     if (
-    #         stock_info
-    #         and isinstance(stock_info, list)
-    #         and stock_info[0].get(field) is not None
-    #     ):
-    #         return stock_info[0][field]
-    #     return None
+    # * Replaces the retired per-ticker get_stock_info_value: searching an
+    # * already-fetched frame avoids refetching just to read one field
+    def lookup_field(
+        self,
+        stock_info_df: pd.DataFrame,
+        field_pattern: str,
+        exact_match: bool = True,
+    ) -> List[str]:
+        """Find columns in a fetched stock-info DataFrame matching a pattern.
+
+        Args:
+            stock_info_df (pd.DataFrame): DataFrame returned by get_stock_info.
+            field_pattern (str): Column name or substring to look for.
+            exact_match (bool, optional): If True, require an exact column name
+                match; otherwise match case-insensitive substrings. Defaults to True.
+
+        Returns:
+            List[str]: The matching column names.
+        """
+        if exact_match:
+            return [col for col in stock_info_df.columns if col == field_pattern]
+
+        # DataFrames are unhashable, so the cache is keyed by identity plus
+        # column count (same convention as the analyzer's result cache)
+        cache_key = (id(stock_info_df), stock_info_df.shape[1])
+        lower_map = self._lower_cols_cache.get(cache_key)
+        if lower_map is None:
+            lower_map = {col.lower(): col for col in stock_info_df.columns}
+            self._lower_cols_cache[cache_key] = lower_map
+
+        pattern = field_pattern.lower()
+        return [orig for low, orig in lower_map.items() if pattern in low]
 
     def get_latest_ohlcv(self, ticker: str) -> Optional[pd.DataFrame]:
         """Get the latest OHLCV (Open, High, Low, Close, Volume) data for a given stock ticker.
@@ -100,17 +261,79 @@ class YFinanceLoader:
             Optional[pd.DataFrame]: The latest OHLCV data as a DataFrame if found, None otherwise.
         """
         try:
-            ohlcv = yf.download(
-                ticker, period="1d", interval="1m", auto_adjust=True, progress=False
+            # history() on a session-backed Ticker reuses the cached
+            # crumb/cookie and returns flat columns, unlike yf.download which
+            # spins up its own threaded downloader per call
+            ohlcv = yf.Ticker(ticker, session=self.session).history(
+                period="1d", interval="1m", auto_adjust=True
             )
-            # Fix the multi-level column issue
-            ohlcv.columns = [i[0] for i in ohlcv.columns]
             ohlcv.reset_index(inplace=True)
             return ohlcv
         except Exception as e:
             logger.error(f"Error fetching OHLCV data for {ticker}: {e}")
             return None
 
+    def get_last_close(self, ticker: str) -> Optional[float]:
+        """Get the latest trade price for a single stock ticker.
+
+        Reads the one lastPrice field from fast_info rather than pulling a
+        full day of 1-minute bars when only this scalar is needed.
+
+        Args:
+            ticker (str): The stock ticker symbol.
+
+        Returns:
+            Optional[float]: The latest price if found, None otherwise.
+        """
+        try:
+            price = yf.Ticker(ticker, session=self.session).fast_info["lastPrice"]
+            return float(price) if price is not None else None
+        except Exception as e:
+            logger.error(f"Error fetching last price for {ticker}: {e}")
+            return None
+
+    def _get_latest_closes(self, tickers: List[str]) -> dict:
+        """Fetch the latest close for several tickers in one bulk download.
+
+        Args:
+            tickers (List[str]): The stock ticker symbols.
+
+        Returns:
+            dict: Mapping of ticker to latest close; tickers with no data are
+                omitted.
+        """
+        if not tickers:
+            return {}
+
+        try:
+            bulk = yf.download(
+                tickers,
+                period="1d",
+                interval="1m",
+                group_by="ticker",
+                threads=True,
+                auto_adjust=True,
+                progress=False,
+                session=self.session,
+            )
+        except Exception as e:
+            logger.error(f"Error bulk downloading OHLCV data: {e}")
+            return {}
+
+        closes = {}
+        for ticker in tickers:
+            try:
+                # yfinance nests columns per ticker for grouped downloads
+                frame = (
+                    bulk[ticker] if isinstance(bulk.columns, pd.MultiIndex) else bulk
+                )
+                series = frame["Close"].dropna()
+                if not series.empty:
+                    closes[ticker] = float(series.iloc[-1])
+            except KeyError:
+                logger.warning(f"No OHLCV data returned for {ticker}")
+        return closes
+
     # ! Might hit a rate limit if we call this too often
     def get_market_cap(
         self, tickers: Union[List[str], str], prefer_calc: bool = False
@@ -132,44 +355,58 @@ class YFinanceLoader:
         if isinstance(tickers, str):
             tickers = [tickers]
 
-        market_caps = []
+        # Pre-size the result list and write by index instead of appending
+        market_caps = [None] * len(tickers)
 
-        # Fetch required data in a more efficient way
+        # Build the lookup straight from the fetch generator so the per-ticker
+        # dicts are never duplicated in an intermediate list
         fields_to_fetch = ["marketCap", "sharesOutstanding"]
-        stock_info_list = self.get_stock_info(
-            tickers=tickers, fields=fields_to_fetch, as_dataframe=False
-        )
+        stock_info_map = {
+            info["symbol"]: info
+            for info in self._iter_stock_info(tickers, fields_to_fetch)
+        }
 
-        stock_info_map = {info["symbol"]: info for info in stock_info_list}
+        # Bulk-fetch the latest close for every ticker that needs a calculated
+        # cap: one HTTP round-trip instead of one per ticker
+        calc_tickers = [
+            ticker
+            for ticker in tickers
+            if (info := stock_info_map.get(ticker))
+            and (prefer_calc or info.get("marketCap") is None)
+            and info.get("sharesOutstanding")
+        ]
+        latest_closes = self._get_latest_closes(calc_tickers)
 
-        for ticker in tickers:
+        for i, ticker in enumerate(tickers):
             market_cap = None
             info = stock_info_map.get(ticker)
 
             if not info:
-                market_caps.append({"symbol": ticker, "marketCap": None})
+                market_caps[i] = {"symbol": ticker, "marketCap": None}
                 continue
 
             # Option 1: Use calculated market cap if preferred or direct is unavailable
             # ! More accurate but introduces performance overhead
             if prefer_calc or info.get("marketCap") is None:
                 shares = info.get("sharesOutstanding")
-                if shares:
-                    ohlcv = self.get_latest_ohlcv(ticker)
-                    if ohlcv is not None and not ohlcv.empty:
-                        latest_price = ohlcv.iloc[-1]["Close"]
-                        market_cap = latest_price * shares
+                latest_price = latest_closes.get(ticker)
+                if shares and latest_price is None:
+                    # Single-field fallback for tickers the bulk download
+                    # returned no bars for
+                    latest_price = self.get_last_close(ticker)
+                if shares and latest_price is not None:
+                    market_cap = latest_price * shares
 
             # Option 2: Use market cap from info if not calculated
             # !IMPORTANT: This may not always be accurate or up-to-date
             if market_cap is None:
                 market_cap = info.get("marketCap")
 
-            market_caps.append({"symbol": ticker, "marketCap": market_cap})
+            market_caps[i] = {"symbol": ticker, "marketCap": market_cap}
 
         df = pd.DataFrame(market_caps).dropna()
         try:
-            MarketCapSchema.validate(df)
+            get_market_cap_schema().validate(df)
             logger.info("Market cap data validation successful.")
         except Exception as e:
             logger.warning(f"Market cap data failed validation: {e}")
@@ -1,6 +1,6 @@
 import pandas as pd
 import seaborn as sns
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from typing import Dict, Optional
 
 
@@ -9,7 +9,12 @@ class PlotBuilder:
 
     def __init__(self, figsize: tuple = (10, 6)):
         sns.set_style("whitegrid")
-        self.fig, self.ax = plt.subplots(figsize=figsize)
+        # Build the Figure directly instead of via plt.subplots so it is not
+        # registered with pyplot's global figure manager: figures built in a
+        # loop get garbage-collected with the builder rather than piling up
+        # until matplotlib warns about >20 open figures
+        self.fig = Figure(figsize=figsize)
+        self.ax = self.fig.subplots()
         self._title = ""  # Title of the plot
         self._xlabel = ""  # X-axis label
         self._ylabel = ""  # Y-axis label
@@ -67,7 +72,39 @@ class PlotBuilder:
         sns.barplot(data=data, x=x, y=y, hue=hue, ax=self.ax)
         return self
 
-    def build(self) -> plt.Figure:
+    def add_paired_bars(
+        self,
+        x,
+        heights_left,
+        heights_right,
+        label_left: str,
+        label_right: str,
+        width: float = 0.4,
+    ) -> "PlotBuilder":
+        """Add two bar series side by side directly from arrays.
+
+        Lighter-weight alternative to add_side_by_side_bars for callers that
+        already hold plain arrays: no DataFrame construction or seaborn
+        dispatch, just two offset ax.bar calls.
+
+        Args:
+            x: The x positions shared by both series.
+            heights_left: Bar heights for the series drawn left of each position.
+            heights_right: Bar heights for the series drawn right of each position.
+            label_left (str): Legend label for the left series.
+            label_right (str): Legend label for the right series.
+            width (float, optional): Width of each bar. Defaults to 0.4.
+
+        Returns:
+            PlotBuilder: The PlotBuilder instance.
+        """
+        offset = width / 2
+        self.ax.bar(x - offset, heights_left, width, label=label_left)
+        self.ax.bar(x + offset, heights_right, width, label=label_right)
+        self.ax.set_xticks(x)
+        return self
+
+    def build(self) -> Figure:
         """Build and return the plot figure."""
         self.ax.set_title(self._title)
         self.ax.set_xlabel(self._xlabel)
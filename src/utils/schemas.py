@@ -1,96 +1,118 @@
 import pandas as pd
 import pandera as pa
 from datetime import datetime
+from functools import lru_cache
 
 current_year = datetime.now().year
 
+# Expected format for "Date added" values, hoisted so validator runs share it
+DATE_FORMAT = "%Y-%m-%d"
+
 
 def is_valid_date(date_series):
     """Check if date strings in Series are valid YYYY-MM-DD format or null"""
 
-    def check_single_date(date_str):
-        if pd.isna(date_str):
-            return True
-        try:
-            datetime.strptime(str(date_str), "%Y-%m-%d")
-            return True
-        except (ValueError, TypeError):
-            return False
+    # One vectorized parse over the whole series instead of a strptime call
+    # per row; unparseable entries come back as NaT. cache=True makes pandas
+    # reuse parses of repeated date strings, which the "Date added" column has
+    # plenty of across index rebalances
+    parsed = pd.to_datetime(
+        date_series, format=DATE_FORMAT, errors="coerce", cache=True
+    )
+    return (parsed.notna() | date_series.isna()).all()
+
+
+# The schemas are built lazily and cached so importing this module doesn't
+# pay pandera's compilation cost; only the first validate() call does
+
+
+@lru_cache(maxsize=1)
+def get_sp500_schema() -> pa.DataFrameSchema:
+    """Get the cached S&P 500 constituent validation schema.
 
-    # Apply the check to each element and return True if all are valid
-    return date_series.apply(check_single_date).all()
+    Returns:
+        pa.DataFrameSchema: The compiled schema, built on first call.
+    """
+    # Classic pandera schema (works with older versions)
+    return pa.DataFrameSchema(
+        {
+            "Symbol": pa.Column(
+                dtype=str,
+                unique=True,
+                nullable=False,
+                description="The ticker symbol for the security.",
+            ),
+            "Security": pa.Column(
+                dtype=str,
+                nullable=False,
+                description="The name of the security (the company).",
+            ),
+            "GICS Sector": pa.Column(
+                dtype=str,
+                nullable=False,
+                description="The GICS Sector the company belongs to.",
+            ),
+            "GICS Sub-Industry": pa.Column(
+                dtype=str,
+                nullable=False,
+                description="The GICS Sub-Industry the company belongs to.",
+            ),
+            "Headquarters Location": pa.Column(
+                dtype=str,
+                nullable=False,
+                description="The city and state/country of the company's headquarters.",
+            ),
+            "Date added": pa.Column(
+                dtype=str,
+                nullable=True,
+                checks=pa.Check(is_valid_date, error="date format is not valid"),
+                description="The date the company was added to the S&P 500 index.",
+            ),
+            "CIK": pa.Column(
+                dtype=int,
+                nullable=False,
+                description="The company's Central Index Key (CIK).",
+            ),
+            "Founded": pa.Column(
+                dtype=object,
+                nullable=False,
+                description="The year the company was founded.",
+            ),
+        },
+        coerce=True,
+        strict=True,
+    )
 
 
-# Classic pandera schema (works with older versions)
-SP500ConstituentSchema = pa.DataFrameSchema(
-    {
-        "Symbol": pa.Column(
-            dtype=str,
-            unique=True,
-            nullable=False,
-            description="The ticker symbol for the security.",
-        ),
-        "Security": pa.Column(
-            dtype=str,
-            nullable=False,
-            description="The name of the security (the company).",
-        ),
-        "GICS Sector": pa.Column(
-            dtype=str,
-            nullable=False,
-            description="The GICS Sector the company belongs to.",
-        ),
-        "GICS Sub-Industry": pa.Column(
-            dtype=str,
-            nullable=False,
-            description="The GICS Sub-Industry the company belongs to.",
-        ),
-        "Headquarters Location": pa.Column(
-            dtype=str,
-            nullable=False,
-            description="The city and state/country of the company's headquarters.",
-        ),
-        "Date added": pa.Column(
-            dtype=str,
-            nullable=True,
-            checks=pa.Check(is_valid_date, error="date format is not valid"),
-            description="The date the company was added to the S&P 500 index.",
-        ),
-        "CIK": pa.Column(
-            dtype=int,
-            nullable=False,
-            description="The company's Central Index Key (CIK).",
-        ),
-        "Founded": pa.Column(
-            dtype=object,
-            nullable=False,
-            description="The year the company was founded.",
-        ),
-    },
-    coerce=True,
-    strict=True,
-)
+@lru_cache(maxsize=1)
+def get_market_cap_schema() -> pa.DataFrameSchema:
+    """Get the cached market cap validation schema.
 
-MarketCapSchema = pa.DataFrameSchema(
-    {
-        "symbol": pa.Column(
-            dtype=str,
-            nullable=False,
-            description="The ticker symbol for the security.",
-        ),
-        "marketCap": pa.Column(
-            dtype=float,
-            nullable=False,
-            checks=[
-                pa.Check(
-                    lambda s: s >= 0,
-                    element_wise=True,
-                    error="marketCap cannot be negative",
-                )
-            ],
-            description="The market capitalization of the company.",
-        ),
-    },
-    coerce=True,
-    strict=True,
-)
+    Returns:
+        pa.DataFrameSchema: The compiled schema, built on first call.
+    """
+    return pa.DataFrameSchema(
+        {
+            "symbol": pa.Column(
+                dtype=str,
+                nullable=False,
+                description="The ticker symbol for the security.",
+            ),
+            "marketCap": pa.Column(
+                dtype=float,
+                nullable=False,
+                checks=[
+                    # Series-level check: pandera evaluates the comparison as
+                    # one vectorized pass rather than calling the lambda per
+                    # element
+                    pa.Check(
+                        lambda s: s >= 0,
+                        error="marketCap cannot be negative",
+                    )
+                ],
+                description="The market capitalization of the company.",
+            ),
+        },
+        coerce=True,
+        strict=True,
+    )